@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 import os
+import time
 from sklearn.cluster import KMeans
 import mediapipe as mp
 
@@ -10,43 +11,130 @@ mp_drawing = mp.solutions.drawing_utils
 
 
 
+# Selfies are close-up, so the short-range model on a downscaled copy finds the
+# face almost every time; the full-range model is only a fallback.
+FACE_CASCADE_MAX_SIDE = 480
+FACE_CASCADE_MIN_SCORE = 0.75
+
+
+def _largest_face(img_rgb, model_selection):
+    """Run MediaPipe Face Detection and return the largest detection (or None)"""
+    with mp.solutions.face_detection.FaceDetection(
+        model_selection=model_selection, min_detection_confidence=0.5) as face_detection:
+        
+        results = face_detection.process(img_rgb)
+        
+        if not results.detections:
+            return None
+        return max(results.detections, key=lambda d: d.location_data.relative_bounding_box.width * 
+                                                     d.location_data.relative_bounding_box.height)
+
+def _cascade_face_detection(img):
+    """Coarse-to-fine detection: short-range on a small copy, full-range fallback.
+    
+    Returns (detection, stage) where stage is "short", "full" or "short-low"
+    (a low-confidence short-range hit kept because the fallback found nothing)."""
+    h, w = img.shape[:2]
+    scale = min(1.0, FACE_CASCADE_MAX_SIDE / max(h, w))
+    small = img if scale == 1.0 else cv2.resize(
+        img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    
+    short = _largest_face(cv2.cvtColor(small, cv2.COLOR_BGR2RGB), model_selection=0)
+    if short is not None and short.score[0] >= FACE_CASCADE_MIN_SCORE:
+        return short, "short"
+    
+    # Fall back to the original full-range pass on the full-resolution image
+    full = _largest_face(cv2.cvtColor(img, cv2.COLOR_BGR2RGB), model_selection=1)
+    if full is None and short is not None:
+        return short, "short-low"
+    return full, "full"
+
+def _bbox_iou(a, b):
+    """IoU of two MediaPipe relative bounding boxes"""
+    ix = max(0.0, min(a.xmin + a.width, b.xmin + b.width) - max(a.xmin, b.xmin))
+    iy = max(0.0, min(a.ymin + a.height, b.ymin + b.height) - max(a.ymin, b.ymin))
+    inter = ix * iy
+    union = a.width * a.height + b.width * b.height - inter
+    return inter / union if union > 0 else 0.0
+
+def _crop_face(img, detection):
+    """Padded face crop for a detection
+    
+    Returns (face_img, (x, y, width, height), face_box) where face_box is the
+    unpadded detection box inside the crop, which shifts when the padding is
+    clipped at an image border."""
+    # Relative coordinates map straight back onto the full-resolution image
+    bbox = detection.location_data.relative_bounding_box
+    h, w = img.shape[:2]
+    
+    # Calculate pixel coordinates
+    face_x = int(bbox.xmin * w)
+    face_y = int(bbox.ymin * h)
+    face_width = int(bbox.width * w)
+    face_height = int(bbox.height * h)
+    
+
+    padding = int(face_width * 0.3)
+    x, y = max(0, face_x-padding), max(0, face_y-padding)
+    width = min(img.shape[1]-x, face_width+2*padding)
+    height = min(img.shape[0]-y, face_height+2*padding)
+    
+    face_img = img[y:y+height, x:x+width]
+    return face_img, (x, y, width, height), (face_x - x, face_y - y, face_width, face_height)
+
 def detect_face(image_path):
     """Detect and extract face from selfie image using MediaPipe Face Detection"""
     img = cv2.imread(image_path)
     if img is None:
         print(f"Error: Could not read image at {image_path}")
-        return None, None
-        
-    with mp.solutions.face_detection.FaceDetection(
-        model_selection=1, min_detection_confidence=0.5) as face_detection:
-        
-        results = face_detection.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-        
-        if not results.detections:
-            print("No face detected in selfie")
-            return None, None
+        return None, None, None
+    
+    detection, _ = _cascade_face_detection(img)
+    if detection is None:
+        print("No face detected in selfie")
+        return None, None, None
+    
+    face_img, coords, face_box = _crop_face(img, detection)
+    cv2.imwrite('detected_face.jpg', face_img)
+    return face_img, coords, face_box
 
-        # Get the largest face detection
-        detection = max(results.detections, key=lambda d: d.location_data.relative_bounding_box.width * 
-                                                          d.location_data.relative_bounding_box.height)
-        bbox = detection.location_data.relative_bounding_box
-        h, w = img.shape[:2]
+def benchmark_face_detection(image_paths, min_iou=0.5):
+    """Compare the cascade against the full-range-only pass on a local test set
+    
+    A short-range hit only counts when its box agrees with the full-range box
+    (IoU >= min_iou), so a fast but wrong detection is not a success."""
+    stats = {'images': 0, 'short_stage': 0, 'short_hits': 0, 'agreements': 0,
+             'cascade_found': 0, 'full_found': 0,
+             'cascade_seconds': 0.0, 'full_seconds': 0.0}
+    for path in image_paths:
+        img = cv2.imread(path)
+        if img is None:
+            continue
+        stats['images'] += 1
         
-        # Calculate pixel coordinates
-        x = int(bbox.xmin * w)
-        y = int(bbox.ymin * h)
-        width = int(bbox.width * w)
-        height = int(bbox.height * h)
+        start = time.perf_counter()
+        cascade, stage = _cascade_face_detection(img)
+        stats['cascade_seconds'] += time.perf_counter() - start
+        stats['cascade_found'] += cascade is not None
         
-    
-        padding = int(width * 0.3)
-        x, y = max(0, x-padding), max(0, y-padding)
-        width = min(img.shape[1]-x, width+2*padding)
-        height = min(img.shape[0]-y, height+2*padding)
+        start = time.perf_counter()
+        full = _largest_face(cv2.cvtColor(img, cv2.COLOR_BGR2RGB), model_selection=1)
+        stats['full_seconds'] += time.perf_counter() - start
+        stats['full_found'] += full is not None
         
-        face_img = img[y:y+height, x:x+width]
-        cv2.imwrite('detected_face.jpg', face_img)
-        return face_img, (x, y, width, height)
+        agrees = (cascade is not None and full is not None and
+                  _bbox_iou(cascade.location_data.relative_bounding_box,
+                            full.location_data.relative_bounding_box) >= min_iou)
+        stats['agreements'] += agrees
+        stats['short_stage'] += stage == "short"
+        stats['short_hits'] += stage == "short" and agrees
+    
+    if stats['images']:
+        stats['short_hit_rate'] = round(stats['short_hits'] / stats['images'], 3)
+        stats['speedup'] = round(stats['full_seconds'] / max(stats['cascade_seconds'], 1e-9), 2)
+    if stats['full_found']:
+        stats['agreement_rate'] = round(stats['agreements'] / stats['full_found'], 3)
+    return stats
 
 def extract_skin(face_img):
     """Extract skin region from face image"""
@@ -75,20 +163,109 @@ def extract_skin(face_img):
     skin = cv2.bitwise_and(face_img, face_img, mask=skin_mask)
     return skin, skin_mask
 
-def get_dominant_skin_color(skin_img, skin_mask):
-    """Determine dominant skin color using clustering"""
+# Population-level LAB skin centroids, learned offline with learn_skin_prior and
+# shipped next to the script. Without them clustering falls back to random KMeans.
+SKIN_PRIOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skin_prior.npy')
+KMEANS_DELTA_E_TOL = 1.0  # converged once no centre moves more than this (CIE76)
+KMEANS_MIN_LEAD = 0.1     # stop earlier if the dominant centre has settled and leads by this
+KMEANS_MAX_ITER = 20
+SKIN_PRIOR_SAMPLES_PER_IMAGE = 2000  # pixels each training image contributes
+
+# OpenCV stores 8-bit L in 0-255; rescale to L* so LAB distances read as delta E
+_LAB_DELTA_E_SCALE = np.array([100 / 255, 1.0, 1.0])
+
+def _skin_lab_pixels(skin_img, skin_mask):
+    """Non-black masked skin pixels as an Nx3 OpenCV LAB array"""
     skin_pixels = skin_img[skin_mask > 0]
     skin_pixels = skin_pixels[np.all(skin_pixels != [0, 0, 0], axis=1)]
     
     if len(skin_pixels) == 0:
-        return None
+        return skin_pixels
+    return cv2.cvtColor(skin_pixels.reshape(-1, 1, 3), cv2.COLOR_BGR2LAB).reshape(-1, 3)
+
+# Loaded once per process rather than on every request
+SKIN_PRIOR = np.load(SKIN_PRIOR_PATH) if os.path.exists(SKIN_PRIOR_PATH) else None
+
+def _warm_start_kmeans(lab_pixels, centroids):
+    """Lloyd iterations seeded from the prior
     
-    lab_pixels = cv2.cvtColor(skin_pixels.reshape(-1, 1, 3), cv2.COLOR_BGR2LAB)
-    kmeans = KMeans(n_clusters=3)
-    kmeans.fit(lab_pixels.reshape(-1, 3))
+    Stops at convergence, or earlier once the dominant cluster has settled and
+    clearly leads, since only its centre is used."""
+    pixels = lab_pixels.astype(np.float64)
+    centroids = centroids.astype(np.float64).copy()
+    k = len(centroids)
     
-    dominant_lab = kmeans.cluster_centers_[np.argmax(np.bincount(kmeans.labels_))]
-    return cv2.cvtColor(np.uint8([[dominant_lab]]), cv2.COLOR_LAB2BGR)[0][0]
+    for iteration in range(1, KMEANS_MAX_ITER + 1):
+        distances = ((pixels[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=k)
+        
+        previous = centroids.copy()
+        filled = counts > 0  # empty clusters keep their previous centre
+        for channel in range(pixels.shape[1]):
+            sums = np.bincount(labels, weights=pixels[:, channel], minlength=k)
+            centroids[filled, channel] = sums[filled] / counts[filled]
+        
+        dominant = int(np.argmax(counts))
+        shifts = np.linalg.norm((centroids - previous) * _LAB_DELTA_E_SCALE, axis=1)
+        if shifts.max() < KMEANS_DELTA_E_TOL:
+            break
+        
+        shares = np.sort(counts)[::-1] / len(pixels)
+        lead = shares[0] - (shares[1] if k > 1 else 0)
+        if shifts[dominant] < KMEANS_DELTA_E_TOL and lead >= KMEANS_MIN_LEAD:
+            break
+    
+    return centroids[dominant], iteration
+
+def get_dominant_skin_color(skin_img, skin_mask):
+    """Determine dominant skin color using clustering
+    
+    Returns (bgr, iterations) so callers can report the clustering cost."""
+    lab_pixels = _skin_lab_pixels(skin_img, skin_mask)
+    if len(lab_pixels) == 0:
+        return None, 0
+    
+    if SKIN_PRIOR is not None and len(lab_pixels) >= len(SKIN_PRIOR):
+        dominant_lab, iterations = _warm_start_kmeans(lab_pixels, SKIN_PRIOR)
+    else:
+        kmeans = KMeans(n_clusters=3)
+        kmeans.fit(lab_pixels)
+        dominant_lab = kmeans.cluster_centers_[np.argmax(np.bincount(kmeans.labels_))]
+        iterations = int(kmeans.n_iter_)
+    
+    return cv2.cvtColor(np.uint8([[dominant_lab]]), cv2.COLOR_LAB2BGR)[0][0], iterations
+
+def learn_skin_prior(image_paths, n_clusters=3, samples_per_image=SKIN_PRIOR_SAMPLES_PER_IMAGE, seed=0):
+    """Fit population-level LAB skin centroids offline and save them for warm starts
+    
+    Each image contributes a fixed-size random sample of its skin pixels, so
+    memory and fit time grow with the number of images, not their resolution."""
+    rng = np.random.default_rng(seed)
+    pixels = []
+    for image_path in image_paths:
+        img = cv2.imread(image_path)
+        if img is None:
+            continue
+        detection, _ = _cascade_face_detection(img)
+        if detection is None:
+            continue
+        face_img, _, _ = _crop_face(img, detection)
+        skin, skin_mask = extract_skin(face_img)
+        lab_pixels = _skin_lab_pixels(skin, skin_mask)
+        if len(lab_pixels):
+            sample = rng.choice(len(lab_pixels), min(samples_per_image, len(lab_pixels)), replace=False)
+            pixels.append(lab_pixels[sample])
+    
+    if not pixels:
+        print("No skin pixels found to learn a prior from")
+        return None
+    
+    kmeans = KMeans(n_clusters=n_clusters, n_init=10)
+    kmeans.fit(np.vstack(pixels))
+    centroids = kmeans.cluster_centers_[np.argsort(kmeans.cluster_centers_[:, 0])]
+    np.save(SKIN_PRIOR_PATH, centroids)
+    return centroids
 
 def classify_skin_tone(rgb):
     """Classify skin tone and undertone"""
@@ -110,17 +287,80 @@ def classify_skin_tone(rgb):
     
     return tone, undertone, brightness
 
-def analyze_skin_texture(face_img):
-    """Analyze skin texture quality"""
-    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
-    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
-    texture_score = np.var(laplacian)
-    
+def classify_texture_score(texture_score):
+    """Map the Laplacian variance of the whole face crop to a texture class"""
     if texture_score < 100: return "Smooth", "Fine texture"
     elif texture_score < 300: return "Normal", "Even texture"
     elif texture_score < 600: return "Combination", "Uneven texture"
     else: return "Rough", "Coarse texture"
 
+# Face zones as (x0, y0, x1, y1) fractions of the detection box returned by
+# _crop_face; a zone may span several rectangles (e.g. both cheeks).
+SKIN_ZONES = {
+    "T-Zone": [(0.25, 0.00, 0.75, 0.20), (0.40, 0.20, 0.60, 0.60)],
+    "Cheeks": [(0.10, 0.45, 0.35, 0.72), (0.65, 0.45, 0.90, 0.72)],
+    "Chin": [(0.30, 0.82, 0.70, 1.00)]
+}
+
+def _rect_sum(table, x0, y0, x1, y1):
+    """Sum of every channel over [y0:y1, x0:x1] in O(1)"""
+    return table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]
+
+def _zone_rect(face_box, rect, w, h):
+    """Pixel corners of a SKIN_ZONES rectangle, clipped to the crop"""
+    fx, fy, fw, fh = face_box
+    rx0, ry0, rx1, ry1 = rect
+    x0, x1 = (min(max(int(fx + r * fw), 0), w) for r in (rx0, rx1))
+    y0, y1 = (min(max(int(fy + r * fh), 0), h) for r in (ry0, ry1))
+    return x0, y0, x1, y1
+
+def analyze_skin_zones(face_img, skin_mask, face_box):
+    """Global texture plus per-zone skin metrics from one Laplacian pass
+    
+    Returns (texture_score, zones). texture_score is the Laplacian variance of
+    the whole crop, as classified by classify_texture_score. Zone texture is a
+    raw variance over skin pixels only, so it is not on the same scale; zones
+    without skin map to None."""
+    h, w = face_img.shape[:2]
+    gray = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+    _, std = cv2.meanStdDev(laplacian)
+    texture_score = float(std[0][0]) ** 2
+    
+    # Summed-area tables of the skin-masked image and Laplacian, built in C
+    mask = (skin_mask > 0).astype(np.uint8)
+    count_table = cv2.integral(mask)
+    color_sum, color_sq = cv2.integral2(cv2.bitwise_and(face_img, face_img, mask=mask),
+                                        sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+    lap_sum, lap_sq = cv2.integral2(laplacian * mask, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+    
+    zones = {}
+    for name, rects in SKIN_ZONES.items():
+        count, color, color2, lap, lap2 = 0, np.zeros(3), np.zeros(3), 0.0, 0.0
+        for rect in rects:
+            corners = _zone_rect(face_box, rect, w, h)
+            count += _rect_sum(count_table, *corners)
+            color = color + _rect_sum(color_sum, *corners)
+            color2 = color2 + _rect_sum(color_sq, *corners)
+            lap += _rect_sum(lap_sum, *corners)
+            lap2 += _rect_sum(lap_sq, *corners)
+        
+        if count == 0:
+            zones[name] = None
+            continue
+        
+        mean_bgr = color / count
+        variance_bgr = np.maximum(color2 / count - mean_bgr ** 2, 0)
+        zone_texture = max(lap2 / count - (lap / count) ** 2, 0)
+        
+        zones[name] = {
+            'color': tuple(int(round(c)) for c in mean_bgr),
+            'color_variance': round(float(variance_bgr.mean()), 1),
+            'texture_score': round(float(zone_texture), 1)
+        }
+    
+    return texture_score, zones
+
 def detect_body_proportions(fullbody_path, face_width):
     """Analyze body proportions from full-body image using MediaPipe Pose"""
     img = cv2.imread(fullbody_path)
@@ -480,6 +720,116 @@ def get_skincare_recommendations(tone, undertone, texture):
 
 
 
+# Append-only result store: a fixed-size header describing the record layout,
+# then fixed-width records read back through np.memmap, so population queries
+# never copy or parse rows.
+RESULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'analysis_results.bin')
+
+TONES = ("Very Fair", "Fair", "Medium", "Tan", "Dark")
+UNDERTONES = ("Warm", "Cool", "Neutral")
+TEXTURES = ("Smooth", "Normal", "Combination", "Rough")
+BODY_TYPES = ("Average", "Hourglass", "Pear", "Inverted Triangle", "Rectangle")
+
+RESULT_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('color', 'u1', (3,)),  # dominant skin colour, BGR
+    ('brightness', '<f4'),
+    ('tone', 'u1'),
+    ('undertone', 'u1'),
+    ('texture', 'u1'),
+    ('body_type', 'u1'),
+    ('shoulder', '<f4'),
+    ('waist', '<f4'),
+    ('hips', '<f4'),
+    ('height', '<f4'),
+    ('shoulder_hip_ratio', '<f4'),
+    ('waist_hip_ratio', '<f4')
+], align=True)
+
+RESULT_STORE_MAGIC = b'OUTFITRN'
+RESULT_STORE_VERSION = 1
+RESULT_STORE_HEADER_SIZE = 512
+
+def _result_store_header():
+    """Magic, version and RESULT_DTYPE.descr, padded to RESULT_STORE_HEADER_SIZE"""
+    layout = f"{RESULT_STORE_VERSION}\n{RESULT_DTYPE.descr!r}\n".encode('ascii')
+    header = RESULT_STORE_MAGIC + layout
+    assert len(header) <= RESULT_STORE_HEADER_SIZE, "result store header overflow"
+    return header.ljust(RESULT_STORE_HEADER_SIZE, b' ')
+
+def _check_result_store_header(path):
+    """Refuse to read or extend a store written with another record layout"""
+    with open(path, 'rb') as f:
+        header = f.read(RESULT_STORE_HEADER_SIZE)
+    if header != _result_store_header():
+        raise ValueError(f"{path} was written with a different result store layout")
+
+def _create_result_store(path):
+    """Create an empty store whose header is complete the moment it appears"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_result_store_header())
+    try:
+        # link() never overwrites, so concurrent first writers cannot clobber each other
+        os.link(tmp_path, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(tmp_path)
+
+def append_result(results, path=RESULT_STORE_PATH):
+    """Append one analysis to the result store as a single fixed-width record"""
+    skin, measurements = results["skin"], results["measurements"]
+    record = np.zeros(1, dtype=RESULT_DTYPE)
+    record['timestamp'] = time.time()
+    record['color'] = skin['dominant_color']
+    record['brightness'] = skin['brightness']
+    record['tone'] = TONES.index(skin['tone'])
+    record['undertone'] = UNDERTONES.index(skin['undertone'])
+    record['texture'] = TEXTURES.index(skin['texture'])
+    record['body_type'] = BODY_TYPES.index(results["body"]["type"])
+    for field in ('shoulder', 'waist', 'hips', 'height', 'shoulder_hip_ratio', 'waist_hip_ratio'):
+        record[field] = measurements.get(field, np.nan)
+    
+    if not os.path.exists(path):
+        _create_result_store(path)
+    _check_result_store_header(path)
+    
+    # One write() in append mode keeps concurrent requests from interleaving records
+    with open(path, 'ab') as f:
+        # Drop a partial record left by an interrupted write so this one stays aligned
+        size = os.fstat(f.fileno()).st_size
+        stray = (size - RESULT_STORE_HEADER_SIZE) % RESULT_DTYPE.itemsize
+        if stray:
+            f.truncate(size - stray)
+        f.write(record.tobytes())
+
+def load_results(path=RESULT_STORE_PATH):
+    """Memory-map every stored record (read-only, zero-copy)"""
+    if not os.path.exists(path):
+        return np.zeros(0, dtype=RESULT_DTYPE)
+    
+    _check_result_store_header(path)
+    
+    # Ignore a trailing partial record left by an interrupted write
+    count = (os.path.getsize(path) - RESULT_STORE_HEADER_SIZE) // RESULT_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RESULT_DTYPE)
+    return np.memmap(path, dtype=RESULT_DTYPE, mode='r',
+                     offset=RESULT_STORE_HEADER_SIZE, shape=(count,))
+
+def tone_distribution(path=RESULT_STORE_PATH):
+    """Count stored analyses per skin tone"""
+    counts = np.bincount(load_results(path)['tone'], minlength=len(TONES))
+    return dict(zip(TONES, counts[:len(TONES)].tolist()))
+
+def waist_hip_histogram(path=RESULT_STORE_PATH, bins=14, value_range=(0.5, 1.2)):
+    """Histogram of stored waist/hip ratios, skipping analyses without a body"""
+    ratios = load_results(path)['waist_hip_ratio']
+    return np.histogram(ratios[np.isfinite(ratios)], bins=bins, range=value_range)
+
+
+
 def create_visual_report(results, selfie_path, fullbody_path):
     """Generate comprehensive visual report image with measurements"""
     selfie_img = cv2.imread(selfie_path)
@@ -591,19 +941,20 @@ def create_visual_report(results, selfie_path, fullbody_path):
 def analyze_images(selfie_path, fullbody_path):
     """Master function to analyze both images with enhanced features"""
     # Process selfie for skin analysis
-    face_img, face_coords = detect_face(selfie_path)
+    face_img, face_coords, face_box = detect_face(selfie_path)
     if face_img is None:
         print("Cannot proceed without face detection")
         return None
     
     skin, skin_mask = extract_skin(face_img)
-    dominant_color = get_dominant_skin_color(skin, skin_mask)
+    dominant_color, kmeans_iterations = get_dominant_skin_color(skin, skin_mask)
     if dominant_color is None:
         print("Failed to determine skin color")
         return None
     
     tone, undertone, brightness = classify_skin_tone(dominant_color)
-    texture, texture_desc = analyze_skin_texture(face_img)
+    texture_score, zones = analyze_skin_zones(face_img, skin_mask, face_box)
+    texture, texture_desc = classify_texture_score(texture_score)
     
     # Process full-body for proportions
     proportions = detect_body_proportions(fullbody_path, face_coords[2])
@@ -615,6 +966,10 @@ def analyze_images(selfie_path, fullbody_path):
             "tone": tone,
             "undertone": undertone,
             "texture": texture,
+            "dominant_color": tuple(int(c) for c in dominant_color),
+            "brightness": round(float(brightness), 1),
+            "kmeans_iterations": kmeans_iterations,
+            "zones": zones,
             "colors": get_color_recommendations(tone, undertone)
         },
         "body": {
@@ -671,6 +1026,7 @@ def analyze_images(selfie_path, fullbody_path):
 
 
 import argparse
+import sys
 import cv2  # Assuming you're using OpenCV
 # Import your custom analysis functions
 # from your_module import analyze_images, create_visual_report
@@ -679,6 +1035,7 @@ def main():
     parser = argparse.ArgumentParser(description="Analyze style from selfie and full-body images")
     parser.add_argument('--selfie', type=str, required=True, help='Path to the selfie image')
     parser.add_argument('--fullbody', type=str, required=True, help='Path to the full-body image')
+    parser.add_argument('--store', type=str, default=RESULT_STORE_PATH, help='Path to the append-only result store')
     args = parser.parse_args()
 
     selfie_path = args.selfie
@@ -688,10 +1045,17 @@ def main():
     results = analyze_images(selfie_path, fullbody_path)
 
     if results:
+        # Diagnostics go to stderr so output.txt only carries the report
+        print(f"KMeans iterations: {results['skin']['kmeans_iterations']}", file=sys.stderr)
+        
         print("\n=== RESULTS ===")
         print("Skin Tone:", results["skin"]["tone"])
         print("Undertone:", results["skin"]["undertone"])
         print("Texture:", results["skin"]["texture"])
+        for zone, metrics in results["skin"]["zones"].items():
+            if metrics:
+                print(f"  {zone}: texture score {metrics['texture_score']}, "
+                      f"color variance {metrics['color_variance']}")
         print("Recommended Colors:", results["skin"]["colors"][:5])
         
         print("\nBody Type:", results["body"]["type"])
@@ -718,6 +1082,12 @@ def main():
         if report_img is not None:
             cv2.imwrite("style_analysis_report.jpg", report_img)
             print("\nVisual report saved as 'style_analysis_report.jpg'")
+        
+        # Analytics only: a store failure must never fail the user's analysis
+        try:
+            append_result(results, args.store)
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not record result in {args.store}: {e}", file=sys.stderr)
     else:
         print("Analysis failed. Please check your images.")
 